@@ -1,48 +1,15 @@
+import threading
+
 import streamlit as st
 import pandas as pd
-from nba_api.stats.endpoints import (
-    leaguestandings, leaguedashplayerstats, leaguedashteamstats, teamgamelog
-)
 import plotly.express as px
 
-st.set_page_config(layout="wide", page_title="NBA Dashboard")
-
-# --- Data Caching (to avoid refetching data on every interaction) ---
-@st.cache_data
-def load_standings(season):
-    try:
-        data = leaguestandings.LeagueStandings(season=season).get_data_frames()[0]
-        return data
-    except Exception as e:
-        st.error(f"Error loading standings data for {season}: {e}")
-        return pd.DataFrame()
-
-@st.cache_data
-def load_player_stats(season):
-    try:
-        data = leaguedashplayerstats.LeagueDashPlayerStats(season=season).get_data_frames()[0]
-        return data
-    except Exception as e:
-        st.error(f"Error loading player statistics for {season}: {e}")
-        return pd.DataFrame()
-
-@st.cache_data
-def load_team_stats(season):
-    try:
-        data = leaguedashteamstats.LeagueDashTeamStats(season=season).get_data_frames()[0]
-        return data
-    except Exception as e:
-        st.error(f"Error loading team statistics for {season}: {e}")
-        return pd.DataFrame()
+from nba_loaders import (
+    TOP_N_MAX, load_standings, load_player_stats, load_team_stats,
+    standings_table, rankable_player_stats, rank_players, team_stats_by_name, prefetch_seasons
+)
 
-@st.cache_data
-def load_team_game_log(team_id, season):
-    try:
-        data = teamgamelog.TeamGameLog(team_id=team_id, season=season).get_data_frames()[0]
-        return data
-    except Exception as e:
-        st.error(f"Error loading game log for team {team_id} in {season}: {e}")
-        return pd.DataFrame()
+st.set_page_config(layout="wide", page_title="NBA Dashboard")
 
 # --- Sidebar for global controls ---
 st.sidebar.header("NBA Dashboard Controls")
@@ -53,86 +20,123 @@ selected_season = st.sidebar.selectbox("Select Season", season_options, index=0)
 # --- Main Dashboard Layout ---
 st.title("Interactive NBA Dashboard")
 
-# --- Tabbed Interface ---
-tab1, tab2, tab3, tab4 = st.tabs(["Team Standings", "Player Statistics", "Team Comparison", "Trends & Distributions"])
+def load_or_report(loader, season, description):
+    # Loaders raise on failure so errors are never cached; report them here and fall back to an empty frame
+    try:
+        return loader(season)
+    except Exception as e:
+        st.error(f"Error loading {description} for {season}: {e}")
+        return pd.DataFrame()
 
-with tab1:
-    st.header(f"NBA Team Standings ({selected_season} Season)")
-    with st.spinner("Loading standings..."):
-        standings_df = load_standings(selected_season)
-    if not standings_df.empty:
-        standings_df['W_PCT'] = pd.to_numeric(standings_df['W_PCT'])
-        st.dataframe(standings_df[['TEAM_NAME', 'W', 'L', 'W_PCT', 'CONF_RANK', 'DIV_RANK', 'HOME_RECORD', 'ROAD_RECORD']].sort_values(by='W_PCT', ascending=False))
-    else:
-        st.warning("No standings data available for the selected season. Please try another season or check your connection.")
+def remembered_index(options, state_key, default=0):
+    # Widgets in a closed tab are not rendered and lose their state, so selections are mirrored into
+    # plain session_state keys and restored from there when the tab is reopened.
+    value = st.session_state.get(state_key)
+    return options.index(value) if value in options else default
 
-with tab2:
+# --- Tab Sections ---
+# Widget changes inside a fragment rerun only that fragment, not the whole page.
+@st.fragment
+def render_player_statistics(selected_season):
     st.header(f"Top Player Statistics ({selected_season} Season)")
     with st.spinner("Loading player statistics..."):
-        player_stats_df = load_player_stats(selected_season)
-
+        player_stats_df = load_or_report(load_player_stats, selected_season, "player statistics")
     if not player_stats_df.empty:
-        # Filter out NaN/inf values from potential statistics before offering them for selection
-        available_stats = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG_PCT', 'AST_PCT', 'USG_PCT', 'PLUS_MINUS']
-        # Ensure selected stats are present and valid in the dataframe
-        valid_stats = [stat for stat in available_stats if stat in player_stats_df.columns and pd.api.types.is_numeric_dtype(player_stats_df[stat])]
+        valid_stats = rankable_player_stats(selected_season)
 
         if not valid_stats:
             st.warning("No valid numeric statistics found for plotting.")
         else:
-            stat_choice = st.selectbox("Select Statistic", valid_stats)
-            top_n = st.slider("Show Top N Players", 5, 50, 10)
-
-            # Sort and display, handling potential NaN values in the chosen stat
-            sorted_players = player_stats_df.sort_values(by=stat_choice, ascending=False).head(top_n)
+            stat_choice = st.selectbox("Select Statistic", valid_stats, key="stat_choice_widget",
+                                       index=remembered_index(valid_stats, 'stat_choice'))
+            top_n = st.slider("Show Top N Players", 5, TOP_N_MAX, st.session_state.get('top_n', 10), key="top_n_widget")
+            st.session_state.stat_choice = stat_choice
+            st.session_state.top_n = top_n
+
+            # The ranking is cached per stat, so moving the slider only slices it
+            sorted_players = rank_players(selected_season, stat_choice).head(top_n)
             st.dataframe(sorted_players[['PLAYER_NAME', 'TEAM_ABBREVIATION', stat_choice, 'GP', 'MIN']])
 
             fig_player_stats = px.bar(sorted_players, x='PLAYER_NAME', y=stat_choice,
                                       title=f"Top {top_n} Players by {stat_choice}",
                                       labels={'PLAYER_NAME': 'Player', stat_choice: stat_choice},
                                       hover_data=['TEAM_ABBREVIATION', 'GP', 'MIN'])
+            # Bars have no WebGL variant; dropping the outline stroke is the cheap rendering win
+            fig_player_stats.update_traces(marker_line_width=0)
             st.plotly_chart(fig_player_stats)
     else:
         st.warning("No player statistics data available for the selected season. Please try another season.")
 
-with tab3:
+@st.fragment
+def render_team_comparison(selected_season):
     st.header(f"Team Performance Comparison ({selected_season} Season)")
     with st.spinner("Loading team statistics..."):
-        team_stats_df = load_team_stats(selected_season)
-
+        team_stats_df = load_or_report(load_team_stats, selected_season, "team statistics")
     if not team_stats_df.empty:
         team_names = team_stats_df['TEAM_NAME'].tolist()
         if len(team_names) < 2:
             st.info("Not enough teams available for comparison in this season.")
         else:
-            team1_name = st.selectbox("Select Team 1", team_names, index=0)
+            team1_name = st.selectbox("Select Team 1", team_names, key="team1_widget",
+                                      index=remembered_index(team_names, 'team1_name'))
             # Ensure team2 default is different from team1, if possible
             default_index_team2 = 1 if len(team_names) > 1 and team_names[0] == team1_name else 0
-            team2_name = st.selectbox("Select Team 2", team_names, index=default_index_team2 if default_index_team2 < len(team_names) else 0)
+            team2_name = st.selectbox("Select Team 2", team_names, key="team2_widget",
+                                      index=remembered_index(team_names, 'team2_name', default_index_team2 if default_index_team2 < len(team_names) else 0))
+            st.session_state.team1_name = team1_name
+            st.session_state.team2_name = team2_name
 
             if team1_name == team2_name:
                 st.warning("Please select two different teams for comparison.")
             else:
-                team1_data = team_stats_df[team_stats_df['TEAM_NAME'] == team1_name].iloc[0]
-                team2_data = team_stats_df[team_stats_df['TEAM_NAME'] == team2_name].iloc[0]
+                team_stats_idx = team_stats_by_name(selected_season)
 
                 comparison_stats = ['PTS', 'REB', 'AST', 'FG_PCT', 'FT_PCT', 'FG3_PCT', 'OFF_RATING', 'DEF_RATING']
                 # Filter comparison_stats to only include those present in the dataframe
-                valid_comparison_stats = [stat for stat in comparison_stats if stat in team1_data.index and stat in team2_data.index]
+                valid_comparison_stats = [stat for stat in comparison_stats if stat in team_stats_idx.columns]
 
                 if not valid_comparison_stats:
                     st.warning("No common valid statistics found for comparison.")
                 else:
-                    comparison_df = pd.DataFrame({
-                        team1_name: [team1_data[stat] for stat in valid_comparison_stats],
-                        team2_name: [team2_data[stat] for stat in valid_comparison_stats]
-                    }, index=valid_comparison_stats)
+                    # One .loc gather for both teams; rows are stats, columns are teams
+                    comparison_df = team_stats_idx.loc[[team1_name, team2_name], valid_comparison_stats].T
+                    comparison_df.columns = [team1_name, team2_name]
                     st.dataframe(comparison_df.transpose())
 
                     comparison_melted = comparison_df.reset_index().melt(id_vars='index', var_name='Team', value_name='Value')
                     fig_team_comp = px.bar(comparison_melted, x='index', y='Value', color='Team', barmode='group',
                                            title=f"Comparison of {team1_name} vs {team2_name}",
                                            labels={'index': 'Statistic', 'Value': 'Value'})
+                    fig_team_comp.update_traces(marker_line_width=0)
                     st.plotly_chart(fig_team_comp)
     else:
-        st.warning("No team statistics data available for the selected season. Please try another season.")
\ No newline at end of file
+        st.warning("No team statistics data available for the selected season. Please try another season.")
+
+# --- Tabbed Interface ---
+# Tabs track which one is open, so only the visible tab's loader runs on each rerun.
+tab1, tab2, tab3, tab4 = st.tabs(["Team Standings", "Player Statistics", "Team Comparison", "Trends & Distributions"],
+                                  key="active_tab", on_change="rerun")
+
+with tab1:
+    if tab1.open:
+        st.header(f"NBA Team Standings ({selected_season} Season)")
+        with st.spinner("Loading standings..."):
+            standings_df = load_or_report(load_standings, selected_season, "standings data")
+        if not standings_df.empty:
+            st.dataframe(standings_table(selected_season))
+        else:
+            st.warning("No standings data available for the selected season. Please try another season or check your connection.")
+
+with tab2:
+    if tab2.open:
+        render_player_statistics(selected_season)
+
+with tab3:
+    if tab3.open:
+        render_team_comparison(selected_season)
+
+# Warm the cache for the next few seasons in the background so switching seasons is instant.
+# The shared rate limiter keeps this from flooding stats.nba.com.
+if 'prefetched' not in st.session_state:
+    st.session_state.prefetched = True
+    threading.Thread(target=prefetch_seasons, args=(season_options[1:4],), daemon=True).start()
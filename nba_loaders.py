@@ -0,0 +1,141 @@
+import threading
+import time
+from datetime import timedelta
+
+import streamlit as st
+import pandas as pd
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from nba_api.stats.endpoints import (
+    leaguestandings, leaguedashplayerstats, leaguedashteamstats, teamgamelog
+)
+from nba_api.stats.library.http import NBAStatsHTTP
+
+# Standings and stat lines change after every game night, so cached data is refreshed every few hours.
+CACHE_TTL = timedelta(hours=6)
+
+# --- HTTP Session (on-disk response cache, global rate limit and retries for stats.nba.com) ---
+class RateLimiter:
+    def __init__(self, max_per_sec):
+        self.interval = 1.0 / max_per_sec
+        self.lock = threading.Lock()
+        self.next_slot = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+class ThrottledHTTPAdapter(HTTPAdapter):
+    # Only cache misses reach the adapter, so cached responses are never throttled.
+    def __init__(self, rate_limiter, **kwargs):
+        self.rate_limiter = rate_limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.rate_limiter.wait()
+        return super().send(request, **kwargs)
+
+@st.cache_resource
+def configure_http_session():
+    # One keep-alive session for every endpoint, so the TCP/TLS handshake is paid once per pooled connection
+    session = requests_cache.CachedSession('nba_cache', backend='sqlite', expire_after=CACHE_TTL)
+    # Retry error status codes only: stats.nba.com usually fails by hanging, and retrying read timeouts
+    # would multiply the endpoint timeout while bypassing the rate limiter.
+    retry = Retry(total=3, connect=1, read=0, status=3, backoff_factor=1.5, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount("https://", ThrottledHTTPAdapter(RateLimiter(max_per_sec=2), max_retries=retry,
+                                                   pool_connections=8, pool_maxsize=8))
+    NBAStatsHTTP.set_session(session)
+    # nba_api's default headers already ask for gzip, but their "Cache-Control: no-cache" and
+    # "Pragma: no-cache" make requests-cache skip every read, so those two are dropped.
+    NBAStatsHTTP.headers = {k: v for k, v in NBAStatsHTTP.headers.items() if k not in ('Cache-Control', 'Pragma')}
+    return session
+
+configure_http_session()
+
+# --- Data Caching (to avoid refetching data on every interaction) ---
+# Team names/abbreviations (30 values) and WL (2 values) compare as integer category codes
+LOW_CARDINALITY_COLUMNS = ('TEAM_NAME', 'TEAM_ABBREVIATION', 'WL')
+
+def categorize(data):
+    for col in LOW_CARDINALITY_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].astype('category')
+    return data
+
+# Each loader reads its endpoint's named result set rather than building a DataFrame for every set,
+# and returns Arrow-backed columns so st.dataframe ships them without a NumPy -> Arrow conversion.
+# Loaders let request errors propagate: a raised exception is never cached, so a failed fetch is retried
+# on the next run instead of an empty frame being served for the whole CACHE_TTL.
+# Callers show their own spinner; the built-in one also needs a script context the prefetch thread lacks.
+# A loader body only runs on a cache miss, so it drops that season's derived entries (below) before
+# refetching; derived caches have no TTL of their own and always match the loader entry they came from.
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_standings(season):
+    standings_table.clear(season)
+    data = leaguestandings.LeagueStandings(season=season).standings.get_data_frame()
+    # Fix dtypes once here so the cached frame is display-ready and never coerced in the render path
+    data['W_PCT'] = pd.to_numeric(data['W_PCT'])
+    return categorize(data.astype({'W': 'int32', 'L': 'int32'}).convert_dtypes(dtype_backend='pyarrow'))
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_player_stats(season):
+    rankable_player_stats.clear(season)
+    for stat in PLAYER_STAT_OPTIONS:
+        rank_players.clear(season, stat)
+    data = leaguedashplayerstats.LeagueDashPlayerStats(season=season).league_dash_player_stats.get_data_frame()
+    # Narrow integer counting stats (GP, PTS, REB, ...) to the smallest dtype that holds them
+    int_cols = data.select_dtypes(include='integer').columns
+    data[int_cols] = data[int_cols].apply(pd.to_numeric, downcast='integer')
+    return categorize(data.convert_dtypes(dtype_backend='pyarrow'))
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_team_stats(season):
+    team_stats_by_name.clear(season)
+    data = leaguedashteamstats.LeagueDashTeamStats(season=season).league_dash_team_stats.get_data_frame()
+    return categorize(data.convert_dtypes(dtype_backend='pyarrow'))
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def load_team_game_log(team_id, season):
+    data = teamgamelog.TeamGameLog(team_id=team_id, season=season).team_game_log.get_data_frame()
+    return categorize(data.convert_dtypes(dtype_backend='pyarrow'))
+
+# --- Derived Data (computed once per season/selection instead of on every rerun) ---
+STANDINGS_COLUMNS = ['TEAM_NAME', 'W', 'L', 'W_PCT', 'CONF_RANK', 'DIV_RANK', 'HOME_RECORD', 'ROAD_RECORD']
+
+@st.cache_resource
+def standings_table(season):
+    table = load_standings(season)[STANDINGS_COLUMNS]
+    return table.sort_values(by='W_PCT', ascending=False).reset_index(drop=True)
+
+PLAYER_STAT_OPTIONS = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG_PCT', 'AST_PCT', 'USG_PCT', 'PLUS_MINUS']
+
+@st.cache_resource
+def rankable_player_stats(season):
+    # Only offer stats that are present and numeric in this season's data
+    df = load_player_stats(season)
+    return [stat for stat in PLAYER_STAT_OPTIONS if stat in df.columns and pd.api.types.is_numeric_dtype(df[stat])]
+
+TOP_N_MAX = 50
+
+@st.cache_resource
+def rank_players(season, stat):
+    # nlargest does a partial selection (O(n log k)) instead of sorting every player
+    return load_player_stats(season).nlargest(TOP_N_MAX, stat).reset_index(drop=True)
+
+@st.cache_resource
+def team_stats_by_name(season):
+    return load_team_stats(season).set_index('TEAM_NAME')
+
+def prefetch_seasons(seasons):
+    # Best effort: nothing failed is cached, so a dropped fetch is retried when the user selects that season
+    for season in seasons:
+        for loader in (load_standings, load_player_stats, load_team_stats):
+            try:
+                loader(season)
+            except Exception:
+                continue